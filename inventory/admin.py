@@ -1,33 +1,58 @@
 import nested_admin
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import F
 
+from .forms import ProductLineForm
 from .models import (
     Attribute,
     AttributeValue,
     Category,
     Product,
+    Product_ProductType,
     ProductImage,
     ProductLine,
+    ProductLine_AttributeValue,
     ProductType,
     SeasonalEvent,
 )
 
-admin.site.register(ProductLine)
-
-
 class ProductImageInline(nested_admin.NestedStackedInline):
     model = ProductImage
     extra = 1
 
 
+class ProductLineAttributeValueInline(nested_admin.NestedTabularInline):
+    model = ProductLine_AttributeValue
+    extra = 1
+    raw_id_fields = ("attribute_value",)
+
+
 class ProductLineInline(nested_admin.NestedStackedInline):
     model = ProductLine
-    inlines = [ProductImageInline]
+    form = ProductLineForm
+    inlines = [ProductImageInline, ProductLineAttributeValueInline]
     extra = 1
 
 
+class ProductTypeInline(nested_admin.NestedTabularInline):
+    model = Product_ProductType
+    extra = 1
+    autocomplete_fields = ("product_type",)
+
+
+class ProductChangeList(ChangeList):
+    # only load the columns the changelist displays, skipping the description text
+    def get_queryset(self, request, exclude_parameters=None):
+        return (
+            super()
+            .get_queryset(request, exclude_parameters)
+            .only("name", "stock_status", "is_active", "category__name")
+        )
+
+
 class ProductAdmin(nested_admin.NestedModelAdmin):
-    inlines = [ProductLineInline]
+    inlines = [ProductTypeInline, ProductLineInline]
 
     list_display = ("name", "category", "stock_status", "is_active")
 
@@ -38,13 +63,32 @@ class ProductAdmin(nested_admin.NestedModelAdmin):
     )
 
     search_fields = ("name",)
+    # skip the extra unfiltered COUNT over the whole table on searches and filters
+    show_full_result_count = False
+
+    # search related rows as you type instead of rendering every row in a select
+    autocomplete_fields = ("category", "seasonal_event")
+
+    # join the category shown in list_display instead of querying it per row
+    list_select_related = ("category",)
+
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
 
 
 admin.site.register(Product, ProductAdmin)
 
 
+class ProductLineAdmin(admin.ModelAdmin):
+    form = ProductLineForm
+
+
+admin.site.register(ProductLine, ProductLineAdmin)
+
+
 class SeasonalEventAdmin(admin.ModelAdmin):
     list_display = ("name", "start_date", "end_date")
+    search_fields = ("name",)
 
 
 admin.site.register(SeasonalEvent, SeasonalEventAdmin)
@@ -71,6 +115,7 @@ class ChildTypeInline(admin.TabularInline):
 
 class ParentTypeAdmin(admin.ModelAdmin):
     inlines = [ChildTypeInline]
+    search_fields = ("name",)
 
 
 admin.site.register(ProductType, ParentTypeAdmin)
@@ -89,10 +134,17 @@ class ParentCategoryAdmin(admin.ModelAdmin):
         "name",
         "parent_name",
     )
+    search_fields = ("name",)
+    show_full_result_count = False
+
+    # annotate the parent's name in the same query so rows need no extra lookups
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(parent_name=F("parent__name"))
 
-    # look at the parent field of the category and return the parent name if it exists
+    # return the annotated parent name, None for top-level categories
+    @admin.display(description="Parent", ordering="parent_name")
     def parent_name(self, obj):
-        return obj.parent.name if obj.parent else None
+        return obj.parent_name
 
 
 admin.site.register(Category, ParentCategoryAdmin)
@@ -0,0 +1,35 @@
+"""Defines Forms for the inventory admin."""
+
+from django import forms
+
+from .models import ProductLine
+
+
+class ProductLineForm(forms.ModelForm):
+    """ModelForm for ProductLine that takes the price as a Decimal, like 12.50, and
+    stores it in the price_cents column.
+
+    Args:
+        price (DecimalField): Product price, up to 999.99
+    """
+
+    price = forms.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+    # show the price first, where the price field used to be
+    field_order = ["price"]
+
+    class Meta:
+        model = ProductLine
+        # attribute values go through ProductLine_AttributeValue, edited inline
+        exclude = ("price_cents", "attribute_values")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.price_cents is not None:
+            self.initial.setdefault("price", self.instance.price)
+
+    # set the price on the instance before the model is validated and saved
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("price") is not None:
+            self.instance.price = cleaned_data["price"]
+        return cleaned_data
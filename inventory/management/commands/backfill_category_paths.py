@@ -0,0 +1,41 @@
+"""Management command to fill in the materialized path of every Category.
+Needed once for categories created before the path column existed. Categories saved
+under a parent without a path are stored without one too, until this is run.
+"""
+
+from django.core.management.base import BaseCommand
+
+from inventory.models import Category
+
+
+class Command(BaseCommand):
+    help = "Recompute Category.path for every category from its chain of parents."
+
+    def handle(self, *args, **options):
+        categories = {
+            category.pk: category
+            for category in Category.objects.only("slug", "parent", "path")
+        }
+        paths = {}
+
+        # walk up to the top-level category, reusing paths already built for parents
+        def build_path(category):
+            if category.pk not in paths:
+                if category.parent_id is None:
+                    paths[category.pk] = category.slug
+                else:
+                    parent = categories[category.parent_id]
+                    paths[category.pk] = f"{build_path(parent)}/{category.slug}"
+            return paths[category.pk]
+
+        changed = []
+        for category in categories.values():
+            path = build_path(category)
+            if category.path != path:
+                category.path = path
+                changed.append(category)
+
+        Category.objects.bulk_update(changed, ["path"], batch_size=500)
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the path of {len(changed)} categories.")
+        )
@@ -0,0 +1,41 @@
+"""Management command to fill in the cached width and height of every ProductImage.
+Needed once for images stored before the dimension columns existed. Until then, each
+of those rows opens its image file whenever it is loaded.
+"""
+
+from django.core.files.images import get_image_dimensions
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from inventory.models import ProductImage
+
+
+class Command(BaseCommand):
+    help = "Read and store the width and height of images that don't have them yet."
+
+    def handle(self, *args, **options):
+        storage = ProductImage._meta.get_field("url").storage
+        # values_list, since loading the images as models would open every file
+        images = (
+            ProductImage.objects.filter(Q(width__isnull=True) | Q(height__isnull=True))
+            .exclude(url="")
+            .values_list("pk", "url")
+        )
+
+        updated = []
+        for pk, name in images.iterator():
+            try:
+                with storage.open(name) as image:
+                    width, height = get_image_dimensions(image)
+            except FileNotFoundError:
+                self.stderr.write(f"Skipped image {pk}: {name} does not exist.")
+                continue
+            if width is None or height is None:
+                self.stderr.write(f"Skipped image {pk}: {name} is not an image.")
+                continue
+            updated.append(ProductImage(pk=pk, width=width, height=height))
+
+        ProductImage.objects.bulk_update(updated, ["width", "height"], batch_size=500)
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the dimensions of {len(updated)} images.")
+        )
@@ -0,0 +1,354 @@
+# Generated by Django 5.0.5 on 2026-10-15 20:47
+
+import django.db.models.deletion
+import inventory.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Attribute",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=200)),
+                ("description", models.TextField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SeasonalEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("start_date", models.DateTimeField()),
+                ("end_date", models.DateTimeField()),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AttributeValue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("attribute_value", models.CharField(max_length=100)),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.attribute",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Enter a category...",
+                        max_length=100,
+                        unique=True,
+                        verbose_name="Inventory Category",
+                    ),
+                ),
+                ("slug", models.SlugField(blank=True, unique=True)),
+                ("is_active", models.BooleanField(default=False)),
+                (
+                    "path",
+                    models.CharField(
+                        blank=True, db_index=True, editable=False, max_length=512
+                    ),
+                ),
+                (
+                    "parent",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="inventory.category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Inventory Category",
+                "verbose_name_plural": "Categories",
+            },
+        ),
+        migrations.CreateModel(
+            name="Product",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("pid", models.CharField(max_length=32, unique=True)),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("slug", models.SlugField(blank=True, unique=True)),
+                ("description", models.TextField(null=True)),
+                ("is_digital", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_active", models.BooleanField(default=False)),
+                (
+                    "stock_status",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "In Stock"),
+                            (2, "Out of Stock"),
+                            (3, "Back Ordered"),
+                        ],
+                        default=2,
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory.category",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-updated_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProductLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("price", models.DecimalField(decimal_places=2, max_digits=5)),
+                (
+                    "sku",
+                    models.UUIDField(
+                        db_default=inventory.models.RandomUUID(),
+                        editable=False,
+                        unique=True,
+                    ),
+                ),
+                ("stock_qty", models.IntegerField(default=0)),
+                ("is_active", models.BooleanField(default=False)),
+                ("order", models.IntegerField()),
+                ("weight", models.FloatField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="inventory.product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("alternative_text", models.CharField(max_length=200)),
+                ("url", models.ImageField(upload_to="")),
+                ("order", models.IntegerField()),
+                (
+                    "product_line",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.productline",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductLine_AttributeValue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "attribute_value",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.attributevalue",
+                    ),
+                ),
+                (
+                    "product_line",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.productline",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="productline",
+            name="attribute_values",
+            field=models.ManyToManyField(
+                related_name="product_lines",
+                through="inventory.ProductLine_AttributeValue",
+                to="inventory.attributevalue",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ProductType",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "parent",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        to="inventory.producttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Product_ProductType",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.product",
+                    ),
+                ),
+                (
+                    "product_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="inventory.producttype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="product_type",
+            field=models.ManyToManyField(
+                related_name="products",
+                through="inventory.Product_ProductType",
+                to="inventory.producttype",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="seasonal_event",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="inventory.seasonalevent",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["parent", "is_active"], name="inventory_c_parent__255a34_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productline_attributevalue",
+            constraint=models.UniqueConstraint(
+                fields=("attribute_value", "product_line"),
+                name="unique_product_line_attribute_value",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="product_producttype",
+            constraint=models.UniqueConstraint(
+                fields=("product", "product_type"), name="unique_product_product_type"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["category", "is_active", "stock_status"],
+                name="inventory_p_categor_5304ba_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["is_active"],
+                name="prod_active_partial",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["-updated_at"], name="prod_updated_at_desc"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.5 on 2026-10-15 20:47
+
+import inventory.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productimage",
+            name="height",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="productimage",
+            name="width",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="productimage",
+            name="url",
+            field=inventory.models.CachedDimensionsImageField(
+                height_field="height", upload_to="products/%Y/%m/", width_field="width"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast, Round
+
+
+# copy the Decimal price into whole cents, rounding off any float error
+def price_to_cents(apps, schema_editor):
+    ProductLine = apps.get_model("inventory", "ProductLine")
+    ProductLine.objects.update(
+        price_cents=Cast(Round(F("price") * 100), IntegerField())
+    )
+
+
+def cents_to_price(apps, schema_editor):
+    ProductLine = apps.get_model("inventory", "ProductLine")
+    ProductLine.objects.update(price=F("price_cents") / 100.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0002_productimage_height_productimage_width_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productline",
+            name="price_cents",
+            field=models.PositiveIntegerField(
+                default=0,
+                validators=[django.core.validators.MaxValueValidator(99999)],
+                verbose_name="Price (cents)",
+            ),
+            preserve_default=False,
+        ),
+        # a default lets the price column be added back when migrating backwards
+        migrations.AlterField(
+            model_name="productline",
+            name="price",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.RunPython(price_to_cents, cents_to_price),
+        migrations.RemoveField(
+            model_name="productline",
+            name="price",
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.5 on 2026-10-15 20:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0003_productline_price_cents"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="product",
+            options={"base_manager_name": "objects", "ordering": ["-updated_at"]},
+        ),
+    ]
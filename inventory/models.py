@@ -1,13 +1,192 @@
 """Defines Models for database tables of inventory for ecommerce site.
 Primary keys are id numbers, BigAutoField.
-UUID version 4 is used in the Product Line model.
+UUID version 4 is used in the Product Line model, generated by the database.
 """
 
-import uuid
+from decimal import ROUND_HALF_UP, Decimal
 
-from django.db import models
+from django.core.validators import MaxValueValidator
+from django.db import models, transaction
+from django.db.models.functions import Concat, Substr
 from django.utils.text import slugify
 
+# shared by the Category name field and the model's Meta
+_CATEGORY_VERBOSE = "Inventory Category"
+
+
+class SluggedManager(models.Manager):
+    """Manager for models with a name and a slug derived from it. bulk_create skips
+    the model's save() method, so missing slugs are filled in here before the single
+    INSERT is issued.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            if not obj.slug:
+                obj.slug = slugify(obj.name)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+# a category's path, left empty when its parent has no path yet rather than built on
+# top of the missing one. backfill_category_paths fills both in afterwards.
+def _category_path(parent_path, slug):
+    return f"{parent_path}/{slug}" if parent_path else ""
+
+
+class CategoryManager(SluggedManager):
+    """Manager for Category. bulk_create skips Category.save(), so it also fills in
+    each category's path, looking parents up in the batch first and then in the
+    database.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            if not obj.slug:
+                obj.slug = slugify(obj.name)
+        in_batch = {obj.pk: obj for obj in objs if obj.pk is not None}
+        parent_ids = {obj.parent_id for obj in objs if obj.parent_id is not None}
+        stored = dict(
+            self.filter(pk__in=parent_ids - in_batch.keys()).values_list("pk", "path")
+        )
+        paths = {}
+
+        # walk up to the top-level category, reusing paths already built for parents
+        def build_path(obj):
+            if id(obj) not in paths:
+                if obj.parent_id is None:
+                    paths[id(obj)] = obj.slug
+                elif obj.parent_id in in_batch:
+                    parent_path = build_path(in_batch[obj.parent_id])
+                    paths[id(obj)] = _category_path(parent_path, obj.slug)
+                else:
+                    parent_path = stored.get(obj.parent_id)
+                    paths[id(obj)] = _category_path(parent_path, obj.slug)
+            return paths[id(obj)]
+
+        for obj in objs:
+            obj.path = build_path(obj)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+# flatten nested select_related lookups into paths, {"a": {"b": {}}} into ["a__b"]
+def _join_paths(joins, prefix=""):
+    paths = []
+    for name, nested in joins.items():
+        if nested:
+            paths.extend(_join_paths(nested, f"{prefix}{name}__"))
+        else:
+            paths.append(f"{prefix}{name}")
+    return paths
+
+
+class DefaultRelatedQuerySet(models.QuerySet):
+    """QuerySet for models whose manager joins the default_related foreign keys into
+    every query. A foreign key can't be deferred and joined at once, so only() and
+    defer() drop the default joins whose fields end up deferred. Joins the caller asked
+    for on fields that are still loaded are kept.
+    """
+
+    default_related = ()
+
+    def only(self, *fields):
+        return super().only(*fields)._drop_deferred_joins()
+
+    def defer(self, *fields):
+        return super().defer(*fields)._drop_deferred_joins()
+
+    def _drop_deferred_joins(self):
+        # Django keeps named select_related() lookups as nested dicts, such as
+        # {"product": {"category": {}}}, and the loaded fields as a mask keyed by
+        # field. tests.DjangoInternalsTests pins both.
+        joins = self.query.select_related
+        select_mask = self.query.get_select_mask()
+        if not isinstance(joins, dict) or not select_mask:
+            return self
+        deferred = {
+            name
+            for name in self.default_related
+            if name in joins and self.model._meta.get_field(name) not in select_mask
+        }
+        if not deferred:
+            return self
+        kept = [
+            path for path in _join_paths(joins) if path.split("__")[0] not in deferred
+        ]
+        queryset = self.select_related(None)
+        # select_related() without lookups would follow every foreign key instead
+        return queryset.select_related(*kept) if kept else queryset
+
+
+class DefaultRelatedManager(models.Manager):
+    """Manager joining its QuerySet's default_related foreign keys into every query."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return queryset.select_related(*queryset.default_related)
+
+
+class AttributeValueQuerySet(DefaultRelatedQuerySet):
+    """QuerySet for AttributeValue, joining the Attribute its __str__ reads."""
+
+    default_related = ("attribute",)
+
+
+class ProductLineQuerySet(DefaultRelatedQuerySet):
+    """QuerySet for ProductLine, joining the Product its __str__ reads."""
+
+    default_related = ("product",)
+
+
+class ProductQuerySet(DefaultRelatedQuerySet):
+    """QuerySet for Product, joining its Category and SeasonalEvent by default."""
+
+    default_related = ("category", "seasonal_event")
+
+
+class ProductManager(
+    SluggedManager, DefaultRelatedManager.from_queryset(ProductQuerySet)
+):
+    """Joins the Category and SeasonalEvent into every Product query. Also used as the
+    base manager, so a Product that Django loads lazily through a foreign key, like
+    product_product_type.product, arrives with them too. Products joined into another
+    model's query with select_related don't go through it.
+    """
+
+
+class RandomUUID(models.Func):
+    """Database function returning a random version 4 UUID, for use as a db_default.
+    Postgres 13+ has gen_random_uuid() built in, SQLite builds one from randomblob().
+    """
+
+    template = "GEN_RANDOM_UUID()"
+    output_field = models.UUIDField()
+    allowed_default = True
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # 32 hex digits with the version nibble set to 4 and the variant to 8-b
+        template = (
+            "LOWER(HEX(RANDOMBLOB(6)) || '4' || SUBSTR(HEX(RANDOMBLOB(2)), 2) || "
+            "SUBSTR('89ab', 1 + (RANDOM() & 3), 1) || "
+            "SUBSTR(HEX(RANDOMBLOB(2)), 2) || HEX(RANDOMBLOB(6)))"
+        )
+        return self.as_sql(compiler, connection, template=template, **extra_context)
+
+
+class CachedDimensionsImageField(models.ImageField):
+    """ImageField for models caching the image's width and height in columns. Rows
+    stored before the dimensions were cached are probed when loaded, until the
+    backfill_image_dimensions command fills them in. A missing file leaves the
+    dimensions empty instead of failing the load.
+    """
+
+    def update_dimension_fields(self, instance, force=False, *args, **kwargs):
+        try:
+            super().update_dimension_fields(instance, force, *args, **kwargs)
+        except FileNotFoundError:
+            pass
+
 
 class Category(models.Model):
     """Class for Category table. Products are organized by Category. Categories have
@@ -21,30 +200,65 @@ class Category(models.Model):
             protected from deletion if they have any parent subcategories.
             null=True allows top-level parents to be created in the database.
             blank=True tells Django that categories can be made without parents.
+        path (CharField): materialized path of slugs from the top-level category down
+            to this one, e.g. "root/sub/leaf". Maintained on save, so a subtree is
+            found with a single path__startswith query.
     """
 
     name = models.CharField(
         max_length=100,
         unique=True,
-        verbose_name="Inventory Category",
+        verbose_name=_CATEGORY_VERBOSE,
         help_text="Enter a category...",
     )
     slug = models.SlugField(unique=True, blank=True)
     is_active = models.BooleanField(default=False)
     parent = models.ForeignKey("self", on_delete=models.PROTECT, null=True, blank=True)
+    path = models.CharField(max_length=512, db_index=True, blank=True, editable=False)
+
+    objects = CategoryManager()
 
     class Meta:
-        verbose_name = "Inventory Category"
+        verbose_name = _CATEGORY_VERBOSE
         # sets the plural version of this class. default just adds an s to the end.
         verbose_name_plural = "Categories"
+        # child categories are looked up by parent, often filtered to active ones
+        indexes = [models.Index(fields=["parent", "is_active"])]
 
     # save method overrides the default django model save behavior
     def save(self, *args, **kwargs):
         # if a slug doesn't exist, create one (using slugify from django.utils.text)
         if not self.slug:
             self.slug = slugify(self.name)
-        # call save method of super class, retaining existing behavior but add slugify
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        # the path only depends on the slug and the parent, skip it if neither is saved
+        if update_fields is not None and not {"slug", "parent", "parent_id"} & set(
+            update_fields
+        ):
+            super().save(*args, **kwargs)
+            return
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "path"}
+        # save the category and its subtree's paths together, or not at all
+        with transaction.atomic():
+            # read both paths from the database, in-memory copies may be stale
+            categories = Category.objects.values_list("path", flat=True)
+            old_path = categories.filter(pk=self.pk).first() if self.pk else None
+            if self.parent_id:
+                parent_path = categories.get(pk=self.parent_id)
+                self.path = _category_path(parent_path, self.slug)
+            else:
+                self.path = self.slug
+            # call save method of super class, retaining existing behavior
+            super().save(*args, **kwargs)
+            # if the category moved or its slug changed, rewrite the paths of the
+            # whole subtree in one UPDATE
+            if old_path and old_path != self.path:
+                Category.objects.filter(path__startswith=f"{old_path}/").update(
+                    path=Concat(
+                        models.Value(self.path), Substr("path", len(old_path) + 1)
+                    )
+                )
 
     # dunderstring returns the name of the category
     def __str__(self):
@@ -90,11 +304,19 @@ class ProductType(models.Model):
         return self.name
 
 
+class StockStatus(models.IntegerChoices):
+    """Stock status of a Product, stored as a small integer."""
+
+    IN_STOCK = 1, "In Stock"
+    OUT_OF_STOCK = 2, "Out of Stock"
+    BACKORDERED = 3, "Back Ordered"
+
+
 class Product(models.Model):
     """this class is for the Product table.
 
     Args:
-        pid (CharField): Product ID number
+        pid (CharField): Unique Product ID number, short SKU-style code
         name (CharField): Unique Product name
         slug (SlugField): Product url-friendly string helps select individual products
         description (TextField): Product description
@@ -102,24 +324,15 @@ class Product(models.Model):
         created_at (DateTimeField): Product data creation date, auto created
         updated_at (DateTimeField): Product data last updated date, auto created
         is_active (BooleanField): Product is active or not
-        stock_status (CharField): options are "IS" | "OOS" | "BO"
+        stock_status (PositiveSmallIntegerField): a StockStatus value
         category (ForeignKey): refrences Category table, set to null on deletion
         seasonal_event (ForeignKey): references SeasonalEvent table, null on deletion
             null=True allows db to accept null values, blank=True allows this in django
-        product_type (ManyToManyField): has a M2M relationship with ProductType table
+        product_type (ManyToManyField): M2M relationship with ProductType table,
+            through Product_ProductType
     """
 
-    IN_STOCK = "IS"
-    OUT_OF_STOCK = "OOS"
-    BACKORDERED = "BO"
-
-    STOCK_STATUS = {
-        IN_STOCK: "In Stock",
-        OUT_OF_STOCK: "Out of Stock",
-        BACKORDERED: "Back Ordered",
-    }
-
-    pid = models.CharField(max_length=255)
+    pid = models.CharField(max_length=32, unique=True)
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField(null=True)
@@ -129,16 +342,35 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=False)
-    stock_status = models.CharField(
-        max_length=3,
-        choices=STOCK_STATUS,
-        default=OUT_OF_STOCK,
+    stock_status = models.PositiveSmallIntegerField(
+        choices=StockStatus.choices,
+        default=StockStatus.OUT_OF_STOCK,
     )
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
     seasonal_event = models.ForeignKey(
         SeasonalEvent, on_delete=models.SET_NULL, null=True, blank=True
     )
-    product_type = models.ManyToManyField(ProductType, related_name="product_type")
+    product_type = models.ManyToManyField(
+        ProductType, through="Product_ProductType", related_name="products"
+    )
+
+    objects = ProductManager()
+
+    class Meta:
+        base_manager_name = "objects"
+        ordering = ["-updated_at"]
+        indexes = [
+            # covers the admin changelist filters: category, stock status and active
+            models.Index(fields=["category", "is_active", "stock_status"]),
+            # partial index, only holds the active products
+            models.Index(
+                fields=["is_active"],
+                condition=models.Q(is_active=True),
+                name="prod_active_partial",
+            ),
+            # default ordering, most recently changed products first
+            models.Index(fields=["-updated_at"], name="prod_updated_at_desc"),
+        ]
 
     # save method overrides the default django model save behavior
     def save(self, *args, **kwargs):
@@ -183,6 +415,8 @@ class AttributeValue(models.Model):
     attribute_value = models.CharField(max_length=100)
     attribute = models.ForeignKey(Attribute, on_delete=models.CASCADE)
 
+    objects = DefaultRelatedManager.from_queryset(AttributeValueQuerySet)()
+
     # dunderstring returns the name and value of the attribute
     def __str__(self):
         return f"{self.attribute.name}: {self.attribute_value}"
@@ -192,27 +426,47 @@ class ProductLine(models.Model):
     """class for Product Line table
 
     Args:
-        price (DecimalField): Product price
-        sku (UUIDField): version 4 uuid for product. https://www.uuidgenerator.net
+        price_cents (PositiveIntegerField): Product price in cents, up to 999.99.
+            The price property reads and writes it as a Decimal.
+        sku (UUIDField): unique version 4 uuid for product, generated by the database
+            on insert. https://www.uuidgenerator.net
         stock_qty (IntegerField): how many of the products are in stock
         is_active (BooleanField): if the product is active
         order (IntegerField): order number of product line
         weight (FloatField): weight of product
         product (ForeignKey): references Product table, protects on deletion
-        attribute_values (ManyToManyField): M2M relationship with AttributeValue table
+        attribute_values (ManyToManyField): M2M relationship with AttributeValue table,
+            through ProductLine_AttributeValue
     """
 
-    price = models.DecimalField(decimal_places=2, max_digits=5)
-    sku = models.UUIDField(default=uuid.uuid4)
+    price_cents = models.PositiveIntegerField(
+        verbose_name="Price (cents)", validators=[MaxValueValidator(99999)]
+    )
+    sku = models.UUIDField(db_default=RandomUUID(), unique=True, editable=False)
     stock_qty = models.IntegerField(default=0)
     is_active = models.BooleanField(default=False)
     order = models.IntegerField()
     weight = models.FloatField()
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     attribute_values = models.ManyToManyField(
-        AttributeValue, related_name="attribute_values"
+        AttributeValue,
+        through="ProductLine_AttributeValue",
+        related_name="product_lines",
     )
 
+    objects = DefaultRelatedManager.from_queryset(ProductLineQuerySet)()
+
+    # price as a Decimal with two decimal places, e.g. 1250 cents is Decimal("12.50")
+    @property
+    def price(self):
+        return Decimal(self.price_cents).scaleb(-2)
+
+    # setting price stores it in cents, rounded half up to the nearest cent
+    @price.setter
+    def price(self, value):
+        cents = Decimal(str(value)) * 100
+        self.price_cents = int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
     # dunderstring returns the name and order number of the attribute
     def __str__(self):
         return f"{self.product.name}: {self.order}"
@@ -224,13 +478,20 @@ class ProductImage(models.Model):
     Args:
         name (CharField): title of product image
         alternative_text (CharField): alt_text for product image
-        url (ImageField): url of image
+        url (ImageField): url of image, uploaded into products/<year>/<month>/
+        width (PositiveIntegerField): image width in pixels, set by url on upload
+        height (PositiveIntegerField): image height in pixels, set by url on upload
         order (IntegerField): ProductImage data order for frontend listing heirarchy
         product_line (ForeignKey): references ProductLine table, cascades on deletion
     """
 
     alternative_text = models.CharField(max_length=200)
-    url = models.ImageField()
+    url = CachedDimensionsImageField(
+        upload_to="products/%Y/%m/", width_field="width", height_field="height"
+    )
+    # cached image dimensions, so the file isn't opened to read them again
+    width = models.PositiveIntegerField(null=True, editable=False)
+    height = models.PositiveIntegerField(null=True, editable=False)
     order = models.IntegerField()
     product_line = models.ForeignKey(ProductLine, on_delete=models.CASCADE)
 
@@ -251,6 +512,14 @@ class ProductLine_AttributeValue(models.Model):
     attribute_value = models.ForeignKey(AttributeValue, on_delete=models.CASCADE)
     product_line = models.ForeignKey(ProductLine, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attribute_value", "product_line"],
+                name="unique_product_line_attribute_value",
+            )
+        ]
+
 
 class Product_ProductType(models.Model):
     """Product_ProductType resolves the M2M relationship between Product and ProductType
@@ -267,6 +536,13 @@ class Product_ProductType(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     product_type = models.ForeignKey(ProductType, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "product_type"], name="unique_product_product_type"
+            )
+        ]
+
 
 # this class might be implemented in the future if needed.
 # class StockControl(models.Model):
@@ -1,3 +1,357 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .forms import ProductLineForm
+from .models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductImage,
+    ProductLine,
+)
+
+
+class CategoryPathTests(TestCase):
+    """Tests for the materialized path maintained by Category.save()."""
+
+    def setUp(self):
+        self.root = Category.objects.create(name="Root")
+        self.sub = Category.objects.create(name="Sub", parent=self.root)
+        self.leaf = Category.objects.create(name="Leaf", parent=self.sub)
+        self.other = Category.objects.create(name="Other")
+
+    def paths(self):
+        return dict(Category.objects.values_list("name", "path"))
+
+    def test_paths_follow_the_parent_chain(self):
+        self.assertEqual(
+            self.paths(),
+            {
+                "Root": "root",
+                "Sub": "root/sub",
+                "Leaf": "root/sub/leaf",
+                "Other": "other",
+            },
+        )
+
+    def test_moving_a_category_rewrites_its_subtree(self):
+        self.sub.parent = self.other
+        self.sub.save()
+
+        paths = self.paths()
+        self.assertEqual(paths["Sub"], "other/sub")
+        self.assertEqual(paths["Leaf"], "other/sub/leaf")
+        self.assertEqual(paths["Root"], "root")
+
+    def test_renaming_a_slug_with_update_fields_saves_the_path(self):
+        self.root.slug = "new-root"
+        self.root.save(update_fields=["slug"])
+
+        paths = self.paths()
+        self.assertEqual(paths["Root"], "new-root")
+        self.assertEqual(paths["Sub"], "new-root/sub")
+        self.assertEqual(paths["Leaf"], "new-root/sub/leaf")
+
+    def test_saving_with_a_stale_parent_uses_the_stored_paths(self):
+        leaf = Category.objects.get(pk=self.leaf.pk)
+        leaf.parent.path  # cache the parent as it is now
+        sub = Category.objects.get(pk=self.sub.pk)
+        sub.slug = "sub-2"
+        sub.save()
+
+        leaf.name = "Leaf 2"
+        leaf.save()
+
+        self.assertEqual(self.paths()["Leaf 2"], "root/sub-2/leaf")
+
+    def test_update_fields_without_slug_or_parent_leaves_paths_alone(self):
+        self.sub.name = "Renamed"
+        self.sub.save(update_fields=["name"])
+
+        paths = self.paths()
+        self.assertEqual(paths["Renamed"], "root/sub")
+        self.assertEqual(paths["Leaf"], "root/sub/leaf")
+
+    def test_category_under_a_parent_without_a_path_gets_none(self):
+        Category.objects.filter(pk=self.root.pk).update(path="")
+        kid = Category.objects.create(name="Kid", parent=self.root)
+
+        self.assertEqual(Category.objects.get(pk=kid.pk).path, "")
+
+
+class CategoryBulkCreateTests(TestCase):
+    """Tests for the paths CategoryManager.bulk_create fills in."""
+
+    def test_bulk_create_builds_paths_from_the_batch_and_the_database(self):
+        root = Category.objects.create(name="Root")
+        Category.objects.bulk_create(
+            [
+                Category(pk=100, name="Top"),
+                Category(pk=101, name="Middle", parent_id=100),
+                Category(pk=102, name="Bottom", parent_id=101),
+                Category(name="Under Root", parent=root),
+            ]
+        )
+
+        self.assertEqual(
+            dict(Category.objects.values_list("name", "path")),
+            {
+                "Root": "root",
+                "Top": "top",
+                "Middle": "top/middle",
+                "Bottom": "top/middle/bottom",
+                "Under Root": "root/under-root",
+            },
+        )
+
+    def test_children_of_bulk_created_categories_get_full_paths(self):
+        (parent,) = Category.objects.bulk_create([Category(name="Parent")])
+        kid = Category.objects.create(name="Kid", parent=parent)
+
+        self.assertEqual(Category.objects.get(pk=kid.pk).path, "parent/kid")
+
+
+class BackfillCategoryPathsTests(TestCase):
+    """Tests for the backfill_category_paths management command."""
+
+    def test_backfill_rebuilds_missing_and_stale_paths(self):
+        root = Category.objects.create(name="Root")
+        sub = Category.objects.create(name="Sub", parent=root)
+        Category.objects.create(name="Leaf", parent=sub)
+        Category.objects.update(path="")
+        Category.objects.filter(pk=sub.pk).update(path="wrong")
+
+        out = StringIO()
+        call_command("backfill_category_paths", stdout=out)
+
+        self.assertEqual(
+            dict(Category.objects.values_list("name", "path")),
+            {"Root": "root", "Sub": "root/sub", "Leaf": "root/sub/leaf"},
+        )
+        self.assertIn("Updated the path of 3 categories.", out.getvalue())
+
+        out = StringIO()
+        call_command("backfill_category_paths", stdout=out)
+        self.assertIn("Updated the path of 0 categories.", out.getvalue())
+
+
+class ProductQuerySetTests(TestCase):
+    """Tests for the default joins ProductManager adds and only()/defer()."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Category")
+        Product.objects.create(name="Product", pid="P1", category=self.category)
+
+    def test_default_joins_load_category_without_a_query(self):
+        product = Product.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(product.category.name, "Category")
+
+    def test_only_drops_the_default_joins_it_defers(self):
+        self.assertNotIn("JOIN", str(Product.objects.only("name").query))
+        product = Product.objects.only("name", "category").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(product.category.name, "Category")
+
+    def test_only_keeps_a_join_the_caller_asked_for(self):
+        product = (
+            Product.objects.select_related("category")
+            .only("name", "category__name")
+            .get()
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(product.category.name, "Category")
+
+    def test_defer_keeps_joins_on_loaded_fields(self):
+        product = Product.objects.defer("description").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(product.category.name, "Category")
+
+    def test_deferred_fields_load_through_the_base_manager(self):
+        product = Product.objects.only("name").get()
+        self.assertIsNone(product.description)
+
+    def test_lazy_foreign_key_loads_join_through_the_base_manager(self):
+        product = Product.objects.get()
+        line = ProductLine.objects.create(
+            price="9.99", order=1, weight=1, product=product
+        )
+        line = ProductLine.objects.only("sku", "product_id").get(pk=line.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(line.product.category.name, "Category")
+
+
+class DefaultRelatedManagerTests(TestCase):
+    """Tests for the AttributeValue and ProductLine default joins with only()."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Category")
+        product = Product.objects.create(name="Product", pid="P1", category=category)
+        ProductLine.objects.create(price="9.99", order=1, weight=1, product=product)
+        attribute = Attribute.objects.create(name="Colour")
+        AttributeValue.objects.create(attribute=attribute, attribute_value="Red")
+
+    def test_str_reads_the_joined_relation(self):
+        line = ProductLine.objects.get()
+        value = AttributeValue.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(line), "Product: 1")
+            self.assertEqual(str(value), "Colour: Red")
+
+    def test_only_without_the_relation_does_not_raise(self):
+        self.assertEqual(ProductLine.objects.only("sku").count(), 1)
+        self.assertEqual(len(ProductLine.objects.only("sku")), 1)
+        self.assertEqual(
+            AttributeValue.objects.only("attribute_value").get().attribute_value, "Red"
+        )
+
+    def test_only_keeps_the_default_join_when_its_field_is_loaded(self):
+        line = ProductLine.objects.only("sku", "product__name").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(line.product.name, "Product")
+
+    def test_only_drops_the_callers_nested_joins_under_a_deferred_default(self):
+        queryset = ProductLine.objects.select_related("product__category").only("sku")
+        self.assertNotIn("JOIN", str(queryset.query))
+
+    def test_defer_keeps_the_callers_nested_joins(self):
+        line = (
+            ProductLine.objects.select_related("product__category")
+            .defer("weight")
+            .get()
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(line.product.category.name, "Category")
+
+
+class DjangoInternalsTests(TestCase):
+    """Pins the Query internals DefaultRelatedQuerySet reads, so a Django upgrade that
+    changes them fails here instead of silently keeping or losing joins.
+    """
+
+    def test_select_related_lookups_are_nested_dicts(self):
+        queryset = ProductLine.objects.select_related(None).select_related(
+            "product__category"
+        )
+        self.assertEqual(queryset.query.select_related, {"product": {"category": {}}})
+        self.assertIs(
+            ProductLine.objects.select_related(None).query.select_related, False
+        )
+
+    def test_select_mask_is_keyed_by_the_loaded_fields(self):
+        select_mask = ProductLine.objects.only("sku").query.get_select_mask()
+        self.assertIn(ProductLine._meta.get_field("sku"), select_mask)
+        self.assertNotIn(ProductLine._meta.get_field("product"), select_mask)
+        self.assertEqual(ProductLine.objects.all().query.get_select_mask(), {})
+
+
+class BackfillImageDimensionsTests(TestCase):
+    """Tests for ProductImage dimensions and the backfill_image_dimensions command."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        category = Category.objects.create(name="Category")
+        product = Product.objects.create(name="Product", pid="P1", category=category)
+        self.line = ProductLine.objects.create(
+            price="9.99", order=1, weight=1, product=product
+        )
+
+    def create_image(self, width, height):
+        content = BytesIO()
+        Image.new("RGB", (width, height)).save(content, "PNG")
+        return ProductImage.objects.create(
+            alternative_text="Image",
+            order=1,
+            product_line=self.line,
+            url=SimpleUploadedFile("image.png", content.getvalue()),
+        )
+
+    def test_upload_stores_the_dimensions(self):
+        image = self.create_image(30, 20)
+        self.assertEqual(
+            ProductImage.objects.values_list("width", "height").get(pk=image.pk),
+            (30, 20),
+        )
+
+    def test_backfill_fills_in_missing_dimensions(self):
+        image = self.create_image(30, 20)
+        ProductImage.objects.update(width=None, height=None)
+
+        out = StringIO()
+        call_command("backfill_image_dimensions", stdout=out)
+
+        self.assertEqual(
+            ProductImage.objects.values_list("width", "height").get(pk=image.pk),
+            (30, 20),
+        )
+        self.assertIn("Updated the dimensions of 1 images.", out.getvalue())
+
+    def test_missing_file_is_skipped_and_still_loads(self):
+        image = self.create_image(30, 20)
+        image.url.storage.delete(image.url.name)
+        ProductImage.objects.update(width=None, height=None)
+
+        self.assertIsNone(ProductImage.objects.get().width)
+
+        out, err = StringIO(), StringIO()
+        call_command("backfill_image_dimensions", stdout=out, stderr=err)
+
+        self.assertIn("does not exist", err.getvalue())
+        self.assertIn("Updated the dimensions of 0 images.", out.getvalue())
+
+
+class ProductLinePriceTests(TestCase):
+    """Tests for the ProductLine price stored in cents and ProductLineForm."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Category")
+        self.product = Product.objects.create(
+            name="Product", pid="P1", category=category
+        )
+
+    def form_data(self, price):
+        return {
+            "price": price,
+            "stock_qty": 0,
+            "order": 1,
+            "weight": 1,
+            "product": self.product.pk,
+        }
+
+    def test_price_setter_rounds_half_up_to_the_cent(self):
+        line = ProductLine(price="0.125")
+        self.assertEqual(line.price_cents, 13)
+        self.assertEqual(line.price, Decimal("0.13"))
+
+    def test_form_saves_a_decimal_price_as_cents(self):
+        form = ProductLineForm(data=self.form_data("12.50"))
+        self.assertTrue(form.is_valid(), form.errors)
+        line = form.save()
+
+        self.assertEqual(ProductLine.objects.get(pk=line.pk).price_cents, 1250)
+
+    def test_form_rejects_prices_over_999_99(self):
+        form = ProductLineForm(data=self.form_data("1000.00"))
+        self.assertFalse(form.is_valid())
+        self.assertIn("price", form.errors)
+
+    def test_form_shows_the_stored_price(self):
+        line = ProductLine.objects.create(
+            price="9.99", order=1, weight=1, product=self.product
+        )
+        form = ProductLineForm(instance=line)
+        self.assertEqual(form.initial["price"], Decimal("9.99"))
+        self.assertNotIn("price_cents", form.fields)